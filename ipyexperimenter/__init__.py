@@ -1,6 +1,7 @@
 from ._version import version_info, __version__
 
 from .experimenter import *
+from .results import *
 
 def _jupyter_nbextension_paths():
     return [{
@@ -0,0 +1,28 @@
+# Standard lib
+from contextlib import contextmanager
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+@contextmanager
+def lock_file(filepath):
+    """
+    Hold an advisory lock on `filepath` + '.lock' so processes sharing a directory take turns writing `filepath`.
+    """
+    with open(filepath + '.lock', 'a') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        else:
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
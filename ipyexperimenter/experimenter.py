@@ -1,14 +1,22 @@
 # Standard lib
+import io
 import os
 import csv
+import html
+import hashlib
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from collections import OrderedDict
 # Third party
 from ipywidgets import (
-    VBox, HBox, Layout, GridBox, Label, Text,
+    VBox, HBox, Layout, GridBox, Label, Text, HTML,
     SelectMultiple, Combobox, Button, Tab, Output
 )
 # Local
 from ipypathchooser import PathChooser
+from .results import ResultsStore
+from ._locking import lock_file
 
 # During development, you'll want to decorate every call that observes a traitlet in
 # `@output.capture` or else these methods can fail silently.
@@ -18,6 +26,12 @@ output = Output(layout={
     'padding': '2px',
 })
 
+# Reserved Param naming the experiment a saved experiment inherits from, stored as its first row
+PARENT_PARAM = '@parent'
+
+# Shared stand-in for experiments without params, so `get_resolved_params` can still recognize its cache
+EMPTY_PARAMS = OrderedDict()
+
 class Experimenter(VBox):
     def __init__(
         self,
@@ -37,6 +51,25 @@ class Experimenter(VBox):
         )
         self.Tab.observe(self.toggle_delete_tab_button, names='selected_index')
 
+        # Saved experiment rows keyed by filepath, as (stat, rows, digest), so unchanged files are not re-read.
+        # See `get_file_stat` for `stat`; `digest` is a hash of the file's contents.
+        self.experiment_cache = {}
+        # The (stat, digest, rows) each tab's file was last loaded or saved as, to detect
+        # and merge changes made by other sessions sharing the experiments directory
+        self.tab_bases = {}
+        # Experiment name -> OrderedDict of Param -> Value, built from the saved csvs.
+        # These hold only the params an experiment overrides; see `get_resolved_params`.
+        self.param_matrix = OrderedDict()
+        # Experiment name -> name of the experiment it inherits from, if not 'defaults'
+        self.experiment_parents = {}
+        # Experiment name -> (inheritance chain of `param_matrix` entries, resolved params)
+        self.resolved_params = {}
+
+        # Slow operations run one at a time on this worker so the kernel stays responsive,
+        # see `dispatch`. `pending` counts those submitted but not yet finished.
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pending = 0
+
         # Menu displayed above the table
         self.edit_tabs_button = Button(
             description='Select visible experiments',
@@ -57,10 +90,21 @@ class Experimenter(VBox):
         )
         self.add_tab_button.on_click(self.add_tab)
 
+        self.compare_button = Button(
+            description='Compare experiments',
+            tooltip='Show the params that differ between saved experiments',
+            icon='table',
+            layout=Layout(
+                width='auto',
+            ),
+        )
+        self.compare_button.on_click(self.toggle_comparison)
+
         button_bar = HBox(
             children=[
                 self.edit_tabs_button,
                 self.add_tab_button,
+                self.compare_button,
             ],
         )
 
@@ -87,6 +131,15 @@ class Experimenter(VBox):
             ],
         )
 
+        # Read-only table of the params that differ between experiments, rendered as a single widget
+        self.comparison = HTML(
+            layout=Layout(
+                display='none',
+                margin=f'{self.vertical_spacing}px 0 0 0',
+                overflow_x='auto',
+            ),
+        )
+
         # The maximum number of simultaenously displayed tabs
         self.max_visible_tabs = 10
 
@@ -169,6 +222,17 @@ class Experimenter(VBox):
         )
         self.run_all_button.on_click(self.run_all)
 
+        # Buttons disabled while an operation is pending on the worker
+        self.busy_buttons = [
+            self.save_tab_button,
+            self.save_all_button,
+            self.run_tab_button,
+            self.run_all_button,
+        ]
+
+        # Kept outside the widgets `hide` hides, so loading and its errors are always visible
+        self.status = Label()
+
         self.run_bar = HBox(
             [self.save_all_button, self.run_tab_button, self.run_all_button],
             layout=Layout(
@@ -177,27 +241,42 @@ class Experimenter(VBox):
         )
 
         def load_experiments(old_path, new_path):
+            # Remove the old tabs now, so they cannot be edited only to be replaced when the load finishes
+            self.hide()
+            self.tabs = []
             # Intialize the tabs based on saved data, if any, in new_path
             self.update_available_experiments(new_path)
+            self.param_matrix = OrderedDict()
+            self.experiment_parents = {}
+            self.resolved_params = {}
+            self.tab_bases = {}
             self.selected_experiments = self.available_experiments[:self.max_visible_tabs]
-            # A list of `VBox` widgets to be put inside a main `Tab` widget
-            tabs = []
-            for t, filename in enumerate(self.selected_experiments):
-                row_kind = self.get_tab_kind(t)
-                filepath = os.path.join(new_path, filename)
-                with open(filepath) as csvfile:
-                    data = list(csv.reader(csvfile, delimiter=';'))
-                    # Assume headers are always Param, Value, Comment
-                    rows = data[1:]
-                    tab = self.make_tab(rows=rows, kind=row_kind, tab_name=filename[:-4])
+            selected_experiments = self.selected_experiments
+            def read_experiments():
+                return [self.read_experiment(filename, directory=new_path) for filename in selected_experiments]
+            def make_tabs(experiments):
+                # A list of `VBox` widgets to be put inside a main `Tab` widget
+                tabs = []
+                for t, (filename, rows) in enumerate(zip(selected_experiments, experiments)):
+                    filepath = os.path.join(new_path, filename)
+                    stat, _, digest = self.experiment_cache[filepath]
+                    row_kind = self.get_tab_kind(t)
+                    # Compare against rows as `get_tab_snapshot` presents them
+                    base_rows = rows
+                    if row_kind == 'combobox':
+                        base_rows = [row[:2] + [''] for row in rows]
+                    self.tab_bases[filepath] = (stat, digest, base_rows)
+                    parent, rows = self.split_parent(rows)
+                    tab = self.make_tab(rows=rows, kind=row_kind, tab_name=filename[:-4], parent=parent)
                     tabs.append(tab)
                     # Populate defaults asap so other tabs can `get_params_and_comments()`
                     self.tabs = tabs
-            # Default intialization
-            if not self.available_experiments:
-                tabs.append(self.make_tab())
-                self.tabs = tabs
-            self.show()
+                # Default intialization
+                if not self.available_experiments:
+                    tabs.append(self.make_tab())
+                    self.tabs = tabs
+                self.show()
+            self.dispatch('Loading experiments', read_experiments, make_tabs)
 
         # TODO: use the default_directory input
         # Pathchoser currently does not initialize in a way that lets it
@@ -215,8 +294,10 @@ class Experimenter(VBox):
             children=[
                 self.pathchooser,
                 self.tab_menu,
+                self.comparison,
                 self.Tab,
                 self.run_bar,
+                self.status,
             ],
             layout=Layout(width='auto'),
             **kwargs,
@@ -238,7 +319,7 @@ class Experimenter(VBox):
         # Also update the displayed names on the tabs
         for t, tab in enumerate(tabs):
             tab_header, _, _ = tab.children
-            tab_name, _, _ = tab_header.children
+            tab_name = tab_header.children[0]
             self.Tab.set_title(t, tab_name.value)
 
     @property
@@ -286,6 +367,13 @@ class Experimenter(VBox):
         comments = [comment for (_, _, comment) in plain_rows]
         return params, comments
 
+    def get_default_comment_map(self):
+        """
+        Return an `OrderedDict` of Param -> Comment from the 'defaults' tab.
+        """
+        params, comments = self.get_params_and_comments()
+        return OrderedDict(zip(params, comments))
+
     def get_default_comments(self):
         """
         Return a list of Comment values from the 'defaults' tab, which must always exist.
@@ -301,9 +389,10 @@ class Experimenter(VBox):
         current_tab_index = self.Tab.selected_index
         self.Tab.set_title(current_tab_index, change['new'])
 
-    def make_tab_header(self, tab_name):
+    def make_tab_header(self, tab_name, parent=''):
         """
         Create an `HBox` widget representing a header for describing and controlling a tab.
+        Tabs other than 'defaults' also get an input set to the `parent` they inherit from.
         """
         tab_name_input = Text(
             description='Tab name:',
@@ -314,6 +403,16 @@ class Experimenter(VBox):
         # Disable changing 'defaults' name
         if tab_name == 'defaults':
             children[0].disabled = True
+        else:
+            experiment_names = [filename[:-4] for filename in self.available_experiments]
+            parent_input = Combobox(
+                description='Inherits:',
+                value=parent,
+                placeholder='defaults',
+                options=[name for name in experiment_names if name not in ('defaults', tab_name)],
+                ensure_option=True,
+            )
+            children.insert(1, parent_input)
         tab_header = HBox(
             children,
             layout=Layout(
@@ -322,20 +421,22 @@ class Experimenter(VBox):
         )
         return tab_header
 
-    def make_tab(self, rows=[], kind='text', tab_name='defaults'):
+    def make_tab(self, rows=[], kind='text', tab_name='defaults', parent=''):
         """
         Create a `VBox` widget representing `rows` as a tab with a header and footer.
         If `rows` is empty, a single blank row will be created.
         All rows on a tab have the same `kind`, either 'text' or 'combobox'.
-        The tab_header will contain an input set to `tab_name`.
+        The tab_header will contain an input set to `tab_name` and, if not 'defaults', `parent`.
         """
-        tab_header = self.make_tab_header(tab_name)
+        tab_header = self.make_tab_header(tab_name, parent=parent)
         children = [self.headers]
         grid_template_areas = '"headers headers headers ."'
         if not rows:
             rows = [['', '', '']]
+        # Read the 'defaults' tab once for every row rather than once per row
+        defaults = self.get_default_comment_map() if kind == 'combobox' else None
         for r, row in enumerate(rows):
-            children.append(self.make_row(r, values=row, kind=kind))
+            children.append(self.make_row(r, values=row, kind=kind, defaults=defaults))
             children.append(self.make_remove_row_button(r))
             grid_template_areas += f'\n"row-{r} row-{r} row-{r} remove-row-{r}"'
         table = GridBox(
@@ -352,11 +453,13 @@ class Experimenter(VBox):
         tab = VBox([tab_header, table, self.tab_footer])
         return tab
 
-    def make_row(self, index, values=[], kind='text'):
+    def make_row(self, index, values=[], kind='text', defaults=None):
         """
         Create an `HBox` representing an input row with a first input of `kind`.
         The inputs will be initialized according to `values`.
         The row will occupy a `grid_area` labeled according to `index`.
+        'combobox' rows offer the params in `defaults`, an `OrderedDict` of Param -> Comment
+        from the 'defaults' tab, and show the comment for theirs rather than one of their own.
         """
         def make_text_input(value=''):
             """
@@ -385,26 +488,26 @@ class Experimenter(VBox):
                     flex='1 1 auto',
                 ),
             )
+        comment = values[2]
         if kind == 'combobox':
-            params, _ = self.get_params_and_comments()
-            first_input = make_combobox_input(value=values[0], params=params)
-
+            if defaults is None:
+                defaults = self.get_default_comment_map()
+            first_input = make_combobox_input(value=values[0], params=list(defaults))
+            comment = defaults.get(values[0], '')
         else:
             first_input = make_text_input(value=values[0])
         inputs = [
             first_input,
             make_text_input(value=values[1]),
-            make_text_input(value=values[2]),
+            make_text_input(value=comment),
         ]
         # Combobox tabs will display comments for the default params they have selected
         def on_combobox_change(change):
             """
             Update the Comment field to match the comments in 'defaults' for the selected param.
+            The 'defaults' tab is read again since it may have been edited after this row was made.
             """
-            params, comments = self.get_params_and_comments()
-            for p, param in enumerate(params):
-                if param == change['new']:
-                    inputs[2].value = comments[p]
+            inputs[2].value = self.get_default_comment_map().get(change['new'], '')
         if kind == 'combobox':
             first_input.observe(on_combobox_change, names='value')
             inputs[2].disabled = True
@@ -425,7 +528,8 @@ class Experimenter(VBox):
             rows = rows[:row_index] + rows[row_index + 1:]
             tab_name = self.get_tab_name(current_tab_index)
             tab_kind = self.get_tab_kind(current_tab_index)
-            new_tab = self.make_tab(rows=rows, kind=tab_kind, tab_name=tab_name)
+            parent = self.get_tab_parent(current_tab_index)
+            new_tab = self.make_tab(rows=rows, kind=tab_kind, tab_name=tab_name, parent=parent)
             self.tabs = self.tabs[:current_tab_index] + [new_tab] + self.tabs[current_tab_index + 1:]
         return remove
 
@@ -445,6 +549,41 @@ class Experimenter(VBox):
         remove.on_click(self.remove_row(index))
         return remove
 
+    @property
+    def results(self):
+        """
+        Get the `ResultsStore` holding run outputs under the experiments directory.
+        """
+        return ResultsStore(os.path.join(self.experiments_directory, 'results'))
+
+    def record_results(self, experiment, scalars=None, metrics=None):
+        """
+        Record a run of `experiment` with its `scalars`, a dict of name -> float,
+        and `metrics`, a dict of name -> iterable of floats, in `self.results`.
+        The run is recorded with the params `experiment` currently resolves to on disk,
+        so later edits to the experiment do not change them. Return the index of the run.
+        Raise a `ValueError` if `experiment` has not been saved in the experiments directory.
+        """
+        if not os.path.exists(self.get_experiment_path(experiment)):
+            raise ValueError(f'No saved experiment named {experiment!r} in {self.experiments_directory}')
+        # Refresh each experiment before following it to its parent
+        name = experiment
+        refreshed = []
+        while name not in refreshed:
+            refreshed.append(name)
+            self.update_param_matrix_entry(f'{name}.csv')
+            name = self.experiment_parents.get(name) or 'defaults'
+        params = self.get_resolved_params(experiment)
+        return self.results.record_run(experiment, params=params, scalars=scalars, metrics=metrics)
+
+    def get_results_table(self):
+        """
+        Return an `OrderedDict` of column name -> column with a row per recorded run:
+        the 'Experiment' column, a column per param recorded with the runs, then a column per scalar output.
+        Scalar columns are memory-mapped and only read as they are accessed.
+        """
+        return self.results.get_table()
+
     def get_tab_kind(self, index):
         """
         Return 'combobox' if index > 0 else 'text'.
@@ -468,9 +607,19 @@ class Experimenter(VBox):
         """
         tab = self.tabs[index]
         tab_header, _, _  = tab.children
-        tab_name, _, _ = tab_header.children
+        tab_name = tab_header.children[0]
         return tab_name.value
 
+    def get_tab_parent(self, index):
+        """
+        Return the name of the experiment the tab at `index` inherits from, or '' for 'defaults'.
+        """
+        tab = self.tabs[index]
+        tab_header, _, _  = tab.children
+        if len(tab_header.children) < 4:
+            return ''
+        return tab_header.children[1].value
+
     def add_row(self, button):
         """
         Create and add a row (an `HBox` of inputs) to the current tab.
@@ -481,36 +630,198 @@ class Experimenter(VBox):
         rows = self.get_plain_table_rows(current_tab_index)
         rows.append(['', '', ''])
         index = len(rows) + 1
-        new_tab = self.make_tab(rows=rows, kind=tab_kind, tab_name=tab_name)
+        parent = self.get_tab_parent(current_tab_index)
+        new_tab = self.make_tab(rows=rows, kind=tab_kind, tab_name=tab_name, parent=parent)
         self.tabs = self.tabs[:current_tab_index] + [new_tab] + self.tabs[current_tab_index + 1:]
 
-    def save_tab(self, index):
+    def get_tab_snapshot(self, index):
         """
-        Save the tab data at index.
+        Return the name of the tab at `index` and the rows to save for it.
+        Tabs other than 'defaults' are saved as a delta: their parent, if any, and the params they override.
+        Their comments are left blank since they are taken from 'defaults'.
         """
         tab_name = self.get_tab_name(index)
+        parent = self.get_tab_parent(index)
         rows = self.get_plain_table_rows(index)
-        filepath = os.path.join(self.experiments_directory, f'{tab_name}.csv')
-        with open(filepath, 'w') as csvfile:
-            writer = csv.writer(csvfile, delimiter=';')
-            writer.writerow(['Param', 'Value', 'Comment'])
-            for row in rows:
-                writer.writerow(row)
+        if self.get_tab_kind(index) == 'combobox':
+            rows = [[param, value, ''] for (param, value, _) in rows]
+        if parent:
+            rows = [[PARENT_PARAM, parent, '']] + rows
+        return tab_name, rows
+
+    def get_file_stat(self, filepath):
+        """
+        Return the (modification time in ns, size) of `filepath`, or None if it does not exist.
+        """
+        try:
+            stat = os.stat(filepath)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def parse_experiment(self, data):
+        """
+        Return the [`Param`, `Value`, `Comment`] rows of the csv file contents `data`.
+        """
+        reader = csv.reader(io.StringIO(data.decode('utf-8'), newline=''), delimiter=';')
+        # Assume headers are always Param, Value, Comment
+        return list(reader)[1:]
+
+    def format_experiment(self, rows):
+        """
+        Return the csv file contents for `rows`.
+        """
+        csvfile = io.StringIO()
+        writer = csv.writer(csvfile, delimiter=';')
+        writer.writerow(['Param', 'Value', 'Comment'])
+        for row in rows:
+            writer.writerow(row)
+        return csvfile.getvalue().encode('utf-8')
+
+    def merge_rows(self, base, ours, theirs):
+        """
+        Three-way merge the rows of an experiment by Param, keeping the changes `ours` and `theirs`
+        each made to `base`. Where both changed a Param differently, `ours` wins unless it deleted it.
+        Return the merged rows, ordered as in `theirs` followed by the rows only `ours` added,
+        and the list of conflicting params.
+        """
+        def by_param(rows):
+            return OrderedDict((row[0], row) for row in rows if row and row[0])
+        base, mine, their = by_param(base), by_param(ours), by_param(theirs)
+        merged = []
+        conflicts = []
+        for param in list(their) + [param for param in mine if param not in their]:
+            old, new, other = base.get(param), mine.get(param), their.get(param)
+            if new == other or new == old:
+                row = other
+            elif other == old:
+                row = new
+            else:
+                conflicts.append(param)
+                row = new if new is not None else other
+            if row is not None:
+                merged.append(row)
+        # `split_parent` expects the parent first
+        merged.sort(key=lambda row: row[0] != PARENT_PARAM)
+        # Blank rows are still being filled in, so keep ours
+        merged += [row for row in ours if not (row and row[0])]
+        return merged, conflicts
+
+    def get_experiment_path(self, tab_name, directory=None):
+        """
+        Return the path of the csv for `tab_name` in `directory`, which defaults to the experiments directory.
+        """
+        return os.path.join(directory or self.experiments_directory, f'{tab_name}.csv')
+
+    def write_experiment(self, filepath, rows, base=None):
+        """
+        Write `rows` to the csv at `filepath` while holding its lock. If the file has changed since `base`,
+        the (stat, digest, rows) it was last loaded or saved as, `rows` are merged with its current rows first.
+        Return the (stat, digest, rows) written and the params that conflicted in the merge.
+        Without a `base`, a file that already exists belongs to another experiment, so nothing is written
+        and (None, []) is returned.
+        Safe to call from the worker since it does not touch any widgets.
+        """
+        conflicts = []
+        with lock_file(filepath):
+            stat = self.get_file_stat(filepath)
+            if stat is not None and base is None:
+                return None, conflicts
+            # Always compare contents: on coarse-mtime filesystems, such as NFS, an edit of the same
+            # size within one tick leaves the stat unchanged. Experiment csvs are small.
+            if stat is not None:
+                with open(filepath, 'rb') as csvfile:
+                    data = csvfile.read()
+                if hashlib.sha256(data).hexdigest() != base[1]:
+                    rows, conflicts = self.merge_rows(base[2], rows, self.parse_experiment(data))
+            data = self.format_experiment(rows)
+            # Replace the file in one step so readers without the lock never see it half written
+            temporary_path = filepath + '.tmp'
+            with open(temporary_path, 'wb') as csvfile:
+                csvfile.write(data)
+            os.replace(temporary_path, filepath)
+            stat = self.get_file_stat(filepath)
+        return (stat, hashlib.sha256(data).hexdigest(), rows), conflicts
+
+    def on_experiment_saved(self, filepath, tab_name, snapshot, written, conflicts):
+        """
+        Update the tab named `tab_name` and the comparison data after its `snapshot` rows were `written`,
+        possibly merged with changes from other sessions, without re-reading what was just written.
+        Return a message for `self.status` if the save was refused or had `conflicts`, else ''.
+        """
+        # A save that finishes after another directory was chosen must not leak into its session
+        if os.path.normpath(os.path.dirname(filepath)) != os.path.normpath(self.experiments_directory):
+            return ''
+        if written is None:
+            return f'Did not save {tab_name}: another experiment was already saved as {tab_name}, rename the tab'
+        stat, digest, rows = written
+        self.experiment_cache[filepath] = (stat, rows, digest)
+        parent, overrides = self.split_parent(rows)
+        self.param_matrix[tab_name] = self.rows_to_params(overrides)
+        self.experiment_parents[tab_name] = parent
+        tab_names = [self.get_tab_name(i) for i in range(len(self.tabs))]
+        if rows != snapshot and tab_name in tab_names:
+            index = tab_names.index(tab_name)
+            if self.get_tab_snapshot(index)[1] == snapshot:
+                # Show the changes merged in from other sessions
+                tab_kind = self.get_tab_kind(index)
+                new_tab = self.make_tab(rows=overrides, kind=tab_kind, tab_name=tab_name, parent=parent)
+                self.tabs = self.tabs[:index] + [new_tab] + self.tabs[index + 1:]
+            else:
+                # The tab was edited during the save, so merge against what it showed on its next save
+                written = (None, None, snapshot)
+        self.tab_bases[filepath] = written
+        if self.comparison.layout.display != 'none':
+            self.render_comparison()
+        if conflicts:
+            return f'Kept your values for params also changed elsewhere in {tab_name}: {", ".join(conflicts)}'
+        return ''
+
+    def save_tab(self, index):
+        """
+        Save the tab data at index.
+        """
+        tab_name, rows = self.get_tab_snapshot(index)
+        filepath = self.get_experiment_path(tab_name)
+        written, conflicts = self.write_experiment(filepath, rows, base=self.tab_bases.get(filepath))
+        self.status.value = self.on_experiment_saved(filepath, tab_name, rows, written, conflicts)
+
+    def save_tabs(self, indices, description):
+        """
+        Save the tabs at `indices` on the worker, showing `description` while busy.
+        The tabs are read immediately so later edits do not race with the write.
+        """
+        snapshots = []
+        for i in indices:
+            tab_name, rows = self.get_tab_snapshot(i)
+            filepath = self.get_experiment_path(tab_name)
+            snapshots.append((filepath, tab_name, rows, self.tab_bases.get(filepath)))
+        def write():
+            return [
+                self.write_experiment(filepath, rows, base=base)
+                for (filepath, _, rows, base) in snapshots
+            ]
+        def on_written(results):
+            messages = [
+                self.on_experiment_saved(filepath, tab_name, rows, written, conflicts)
+                for (filepath, tab_name, rows, _), (written, conflicts) in zip(snapshots, results)
+            ]
+            self.status.value = '; '.join(message for message in messages if message)
+        self.dispatch(description, write, on_written)
 
     def save_current_tab(self, button):
         """
         Save the current tab's data as a csv file.
         """
         current_tab_index = self.Tab.selected_index
-        self.save_tab(current_tab_index)
+        self.save_tabs([current_tab_index], f'Saving {self.get_tab_name(current_tab_index)}')
 
     def save_all(self, button):
         """
         Save all tab's data as csv files.
         """
         # TODO: delete any csvs in the folder before saving all
-        for i, tab in enumerate(self.tabs):
-            self.save_tab(i)
+        self.save_tabs(range(len(self.tabs)), 'Saving all experiments')
 
     def delete_tab(self, button):
         """
@@ -531,21 +842,176 @@ class Experimenter(VBox):
         """
         self.edit_tab_menu.layout.display = None
 
-    def update_available_experiments(self, directory):
+    def list_experiments(self, directory):
         """
-        Scan the input directory to determine the available experiments.
+        Return the csv filenames in `directory`, 'defaults.csv' first.
         """
         csvs = filter(lambda f: f.endswith('.csv'), os.listdir(directory))
         def defaults_first(experiment_name):
             return '' if experiment_name == 'defaults.csv' else experiment_name
-        experiment_names = sorted(csvs, key=defaults_first)
-        self.available_experiments = list(experiment_names)
+        return sorted(csvs, key=defaults_first)
+
+    def update_available_experiments(self, directory):
+        """
+        Scan the input directory to determine the available experiments.
+        """
+        self.available_experiments = self.list_experiments(directory)
         self.tab_select.options = self.available_experiments
 
+    def read_experiment(self, filename, directory=None):
+        """
+        Return the [`Param`, `Value`, `Comment`] rows saved in `filename` in `directory`,
+        which defaults to the experiments directory.
+        Files are only re-read when their modification time or size has changed since the last read.
+        """
+        filepath = os.path.join(directory or self.experiments_directory, filename)
+        stat = self.get_file_stat(filepath)
+        cached = self.experiment_cache.get(filepath)
+        if cached is not None and cached[0] == stat:
+            return cached[1]
+        with open(filepath, 'rb') as csvfile:
+            data = csvfile.read()
+        rows = self.parse_experiment(data)
+        self.experiment_cache[filepath] = (stat, rows, hashlib.sha256(data).hexdigest())
+        return rows
+
+    def split_parent(self, rows):
+        """
+        Return the parent named by a leading `PARENT_PARAM` row in `rows`, or '', and the remaining rows.
+        """
+        if rows and rows[0] and rows[0][0] == PARENT_PARAM:
+            return rows[0][1], rows[1:]
+        return '', rows
+
+    def rows_to_params(self, rows):
+        """
+        Return an `OrderedDict` mapping each Param in `rows` to its Value, skipping blank params.
+        """
+        return OrderedDict((row[0], row[1]) for row in rows if row and row[0] and row[0] != PARENT_PARAM)
+
+    def get_inheritance_chain(self, name):
+        """
+        Return the names of the experiments `name` inherits from, starting with 'defaults' and ending with `name`.
+        """
+        chain = [name]
+        while chain[-1] != 'defaults':
+            parent = self.experiment_parents.get(chain[-1]) or 'defaults'
+            # Treat a cycle as inheriting straight from 'defaults'
+            if parent in chain:
+                parent = 'defaults'
+            chain.append(parent)
+        return chain[::-1]
+
+    def get_resolved_params(self, name):
+        """
+        Return an `OrderedDict` of every Param -> Value for experiment `name`, applying its overrides
+        over those of its parents and 'defaults'. The result is cached until an experiment in the chain changes.
+        """
+        deltas = tuple(self.param_matrix.get(n, EMPTY_PARAMS) for n in self.get_inheritance_chain(name))
+        cached = self.resolved_params.get(name)
+        if cached is not None and len(cached[0]) == len(deltas) \
+                and all(old is new for (old, new) in zip(cached[0], deltas)):
+            return cached[1]
+        resolved = OrderedDict()
+        for delta in deltas:
+            resolved.update(delta)
+        self.resolved_params[name] = (deltas, resolved)
+        return resolved
+
+    def update_param_matrix(self):
+        """
+        Bring `self.param_matrix` in line with the saved experiments, re-reading only changed files.
+        Called on explicit refreshes only; `save_tab` keeps the saved experiment's entry up to date.
+        """
+        filenames = self.list_experiments(self.experiments_directory)
+        names = [filename[:-4] for filename in filenames]
+        for name in list(self.param_matrix):
+            if name not in names:
+                del self.param_matrix[name]
+                self.experiment_parents.pop(name, None)
+                self.resolved_params.pop(name, None)
+        for filename in filenames:
+            self.update_param_matrix_entry(filename)
+
+    def update_param_matrix_entry(self, filename):
+        """
+        Bring the `self.param_matrix` entry for `filename` in line with the saved file,
+        dropping it if the file does not exist.
+        """
+        name = filename[:-4]
+        filepath = os.path.join(self.experiments_directory, filename)
+        if not os.path.exists(filepath):
+            self.param_matrix.pop(name, None)
+            self.experiment_parents.pop(name, None)
+            self.resolved_params.pop(name, None)
+            return
+        cached = self.experiment_cache.get(filepath)
+        rows = self.read_experiment(filename)
+        if name not in self.param_matrix or cached is None or cached[1] is not rows:
+            parent, rows = self.split_parent(rows)
+            self.param_matrix[name] = self.rows_to_params(rows)
+            self.experiment_parents[name] = parent
+
+    def get_param_matrix(self):
+        """
+        Return the Param names of the 'defaults' tab, the experiment names, and an experiments x params
+        list of lists of Values. Params an experiment does not set are inherited as in `get_resolved_params`.
+        """
+        params, _ = self.get_params_and_comments()
+        params = [param for param in params if param]
+        names = list(self.param_matrix)
+        matrix = []
+        for name in names:
+            values = self.get_resolved_params(name)
+            matrix.append([values.get(param, '') for param in params])
+        return params, names, matrix
+
+    def get_differing_params(self, params, matrix):
+        """
+        Return the indices of the columns of `matrix` whose values are not the same for every experiment.
+        """
+        return [
+            p for p in range(len(params))
+            if len(set(row[p] for row in matrix)) > 1
+        ]
+
+    def render_comparison(self):
+        """
+        Render the params that differ between saved experiments as an HTML table in `self.comparison`.
+        """
+        params, names, matrix = self.get_param_matrix()
+        columns = self.get_differing_params(params, matrix)
+        if not columns:
+            self.comparison.value = '<i>All saved experiments use the same params.</i>'
+            return
+        cell = 'style="border: 1px solid gray; padding: 2px 8px;"'
+        header = ''.join(f'<th {cell}>{html.escape(params[p])}</th>' for p in columns)
+        body = ''
+        for name, row in zip(names, matrix):
+            cells = ''.join(f'<td {cell}>{html.escape(row[p])}</td>' for p in columns)
+            body += f'<tr><th {cell}>{html.escape(name)}</th>{cells}</tr>'
+        self.comparison.value = (
+            f'<table style="border-collapse: collapse;">'
+            f'<tr><th {cell}>Experiment</th>{header}</tr>{body}</table>'
+        )
+
+    def toggle_comparison(self, button):
+        """
+        Toggle the visibility of `self.comparison`, refreshing it when shown.
+        """
+        if self.comparison.layout.display == 'none':
+            self.update_param_matrix()
+            self.render_comparison()
+            self.comparison.layout.display = None
+        else:
+            self.comparison.layout.display = 'none'
+
     def toggle_delete_tab_button(self, change):
         """
         Toggle whether the delete tab button is enabled or disabled when the `tab_index` changes.
         """
+        if change.new is None:
+            return
         tab_name = self.get_tab_name(change.new)
         self.delete_tab_button.disabled = tab_name == 'defaults'
 
@@ -562,17 +1028,68 @@ class Experimenter(VBox):
         Hide the components of the widget other than the Pathchooser.
         """
         self.tab_menu.layout.display = 'none'
+        self.comparison.layout.display = 'none'
         self.Tab.layout.display = 'none'
         self.run_bar.layout.display = 'none'
 
-    def run_tab(self):
+    def dispatch(self, description, work, done=None):
         """
-        Run the selected notebook(s) with the params in the current tab.
+        Call `work` on the worker, showing `description` in `self.status` and disabling
+        `self.busy_buttons` until it finishes. Then call `done` with its result on the kernel's
+        event loop, where widgets can be updated safely. Errors raised by `work` or `done` are shown in `self.status`.
+        Outside of a running event loop, `work` and `done` are called immediately instead.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None or threading.current_thread() is not threading.main_thread():
+            result = work()
+            if done is not None:
+                done(result)
+            return
+        self.pending += 1
+        self.status.value = f'{description}...'
+        for button in self.busy_buttons:
+            button.disabled = True
+        def finish(future):
+            self.pending -= 1
+            if self.pending == 0:
+                for button in self.busy_buttons:
+                    button.disabled = False
+                # Keep 'defaults' undeletable
+                if self.Tab.selected_index is not None:
+                    self.delete_tab_button.disabled = self.get_tab_name(self.Tab.selected_index) == 'defaults'
+            error = future.exception()
+            if error is not None:
+                self.status.value = f'{description} failed: {error!r}'
+                return
+            if self.pending == 0:
+                self.status.value = ''
+            if done is not None:
+                try:
+                    done(future.result())
+                except Exception as error:
+                    self.status.value = f'{description} failed: {error!r}'
+        future = self.executor.submit(work)
+        future.add_done_callback(lambda future: loop.call_soon_threadsafe(finish, future))
+
+    def run_experiments(self, tab_names):
+        """
+        Run the selected notebook(s) with the params of each of `tab_names`.
         """
         raise NotImplementedError
 
-    def run_all(self):
+    def run_tab(self, button):
+        """
+        Run the selected notebook(s) with the params in the current tab.
+        """
+        tab_name = self.get_tab_name(self.Tab.selected_index)
+        self.dispatch(f'Running {tab_name}', lambda: self.run_experiments([tab_name]))
+
+    def run_all(self, button):
         """
         Run the selected notebook(s) with the parms from every tab.
         """
-        raise NotImplementedError
+        tab_names = [self.get_tab_name(i) for i in range(len(self.tabs))]
+        self.dispatch('Running all experiments', lambda: self.run_experiments(tab_names))
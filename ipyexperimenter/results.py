@@ -0,0 +1,288 @@
+# Standard lib
+import os
+import csv
+import json
+import mmap
+import hashlib
+from array import array
+from collections import OrderedDict
+# Local
+from ._locking import lock_file
+
+class ResultsStore:
+    """
+    An append-only, columnar store for the outputs of experiment runs, kept under `directory`:
+
+        runs.csv                one experiment name and params digest per run, in the order they were recorded
+        runs.state              the number of recorded runs and the size of runs.csv they occupy
+        params/<digest>.json    the params a run used, shared by every run that used the same ones
+        scalars/<name>.f8       one float per run, for each scalar output
+        metrics/<name>.f8       the time series of every run for a metric, one after another
+        metrics/<name>.offsets  one int per run, where that run's series ends in metrics/<name>.f8
+
+    Columns are raw native-endian float64s or int64s, read back as memory-mapped `memoryview`s so
+    aggregating many runs does not load them into memory. `numpy.asarray` wraps them without copying.
+    Runs are recorded while holding a lock on runs.csv, so several processes can share a store.
+    A run only becomes visible once runs.state counts it, so readers need no lock.
+    """
+    extension = '.f8'
+    offsets_extension = '.offsets'
+    missing = float('nan')
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.runs_path = os.path.join(directory, 'runs.csv')
+        self.state_path = os.path.join(directory, 'runs.state')
+        self.params_directory = os.path.join(directory, 'params')
+        self.scalars_directory = os.path.join(directory, 'scalars')
+        self.metrics_directory = os.path.join(directory, 'metrics')
+
+    def check_name(self, name):
+        """
+        Raise a `ValueError` if `name` cannot be used as a file name within the store.
+        """
+        if not name or name in ('.', '..') or os.sep in name or (os.altsep and os.altsep in name):
+            raise ValueError(f'Invalid name for a results column: {name!r}')
+
+    def read_state(self):
+        """
+        Return the number of recorded runs and the size of runs.csv they occupy.
+        """
+        if not os.path.exists(self.state_path):
+            return 0, 0
+        with open(self.state_path) as state_file:
+            run_count, runs_size = state_file.read().split()
+        return int(run_count), int(runs_size)
+
+    def write_state(self, run_count, runs_size):
+        """
+        Replace runs.state in one step, making the first `run_count` runs visible to readers.
+        """
+        temporary_path = f'{self.state_path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w') as state_file:
+            state_file.write(f'{run_count} {runs_size}')
+        os.replace(temporary_path, self.state_path)
+
+    def get_run_count(self):
+        """
+        Return the number of recorded runs.
+        """
+        return self.read_state()[0]
+
+    def read_runs(self):
+        """
+        Return the (experiment name, params digest) of every recorded run, in order.
+        """
+        run_count, runs_size = self.read_state()
+        if not run_count:
+            return []
+        with open(self.runs_path, 'rb') as runs_file:
+            data = runs_file.read(runs_size)
+        reader = csv.reader(data.decode('utf-8').splitlines(), delimiter=';')
+        return [tuple(row) for row in reader]
+
+    def get_runs(self):
+        """
+        Return the experiment name of every recorded run, in order.
+        """
+        return [experiment for (experiment, _) in self.read_runs()]
+
+    def get_params(self, digest):
+        """
+        Return the `OrderedDict` of Param -> Value saved under `digest`.
+        """
+        with open(os.path.join(self.params_directory, f'{digest}.json')) as params_file:
+            return OrderedDict(json.load(params_file))
+
+    def write_params(self, params):
+        """
+        Save `params`, a dict of Param -> Value, unless identical params were saved before,
+        and return the digest they are saved under.
+        """
+        data = json.dumps(list(params.items()))
+        digest = hashlib.sha256(data.encode('utf-8')).hexdigest()
+        filepath = os.path.join(self.params_directory, f'{digest}.json')
+        if not os.path.exists(filepath):
+            os.makedirs(self.params_directory, exist_ok=True)
+            temporary_path = f'{filepath}.{os.getpid()}.tmp'
+            with open(temporary_path, 'w') as params_file:
+                params_file.write(data)
+            os.replace(temporary_path, filepath)
+        return digest
+
+    def list_columns(self, directory, extension):
+        """
+        Return the names of the columns in `directory` whose files end with `extension`.
+        """
+        if not os.path.isdir(directory):
+            return []
+        return sorted(f[:-len(extension)] for f in os.listdir(directory) if f.endswith(extension))
+
+    def get_scalar_names(self):
+        """
+        Return the names of the recorded scalar outputs.
+        """
+        return self.list_columns(self.scalars_directory, self.extension)
+
+    def get_metric_names(self):
+        """
+        Return the names of the recorded metrics.
+        """
+        return self.list_columns(self.metrics_directory, self.offsets_extension)
+
+    def get_scalar_path(self, name):
+        """
+        Return the path of the column of scalar output `name`.
+        """
+        return os.path.join(self.scalars_directory, name + self.extension)
+
+    def get_metric_paths(self, name):
+        """
+        Return the paths of the values and offsets columns of metric `name`.
+        """
+        return (
+            os.path.join(self.metrics_directory, name + self.extension),
+            os.path.join(self.metrics_directory, name + self.offsets_extension),
+        )
+
+    def append_values(self, filepath, values, typecode='d'):
+        """
+        Append `values`, of the `array` type `typecode`, to the column at `filepath`.
+        """
+        with open(filepath, 'ab') as column_file:
+            column_file.write(array(typecode, values).tobytes())
+
+    def get_length(self, filepath, typecode='d'):
+        """
+        Return the number of values in the column at `filepath`.
+        """
+        if not os.path.exists(filepath):
+            return 0
+        return os.path.getsize(filepath) // array(typecode).itemsize
+
+    def truncate(self, filepath, length, typecode='d'):
+        """
+        Drop any values after the first `length` in the column at `filepath`.
+        """
+        if self.get_length(filepath, typecode) > length:
+            os.truncate(filepath, length * array(typecode).itemsize)
+
+    def read_last(self, filepath, typecode='d'):
+        """
+        Return the last value in the non-empty column at `filepath`.
+        """
+        itemsize = array(typecode).itemsize
+        with open(filepath, 'rb') as column_file:
+            column_file.seek(-itemsize, os.SEEK_END)
+            return array(typecode, column_file.read(itemsize))[0]
+
+    def read_column(self, filepath, length=None, typecode='d'):
+        """
+        Memory-map the column at `filepath` as a read-only `memoryview` of `typecode` values,
+        truncated to `length` values if given.
+        """
+        if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
+            return memoryview(array(typecode))
+        with open(filepath, 'rb') as column_file:
+            mapped = mmap.mmap(column_file.fileno(), 0, access=mmap.ACCESS_READ)
+        itemsize = array(typecode).itemsize
+        view = memoryview(mapped)[:len(mapped) - len(mapped) % itemsize].cast(typecode)
+        return view if length is None else view[:length]
+
+    def discard_unlisted(self, run_count, runs_size):
+        """
+        Drop whatever a record that never finished wrote after the first `run_count` runs.
+        Must be called while holding the lock on runs.csv.
+        """
+        if os.path.exists(self.runs_path) and os.path.getsize(self.runs_path) > runs_size:
+            os.truncate(self.runs_path, runs_size)
+        for name in self.get_scalar_names():
+            self.truncate(self.get_scalar_path(name), run_count)
+        for name in self.get_metric_names():
+            values_path, offsets_path = self.get_metric_paths(name)
+            self.truncate(offsets_path, run_count, typecode='q')
+            end = self.read_last(offsets_path, typecode='q') if self.get_length(offsets_path, 'q') else 0
+            self.truncate(values_path, end)
+
+    def record_run(self, experiment, params=None, scalars=None, metrics=None):
+        """
+        Append a run of `experiment` that used `params`, a dict of Param -> Value, with `scalars`,
+        a dict of name -> float, and `metrics`, a dict of name -> iterable of floats forming
+        that metric's time series for this run. Return the index of the run.
+        """
+        self.check_name(experiment)
+        scalars = scalars or {}
+        metrics = {name: list(map(float, values)) for (name, values) in (metrics or {}).items()}
+        for name in list(scalars) + list(metrics):
+            self.check_name(name)
+        os.makedirs(self.scalars_directory, exist_ok=True)
+        os.makedirs(self.metrics_directory, exist_ok=True)
+        with lock_file(self.runs_path):
+            run_count, runs_size = self.read_state()
+            self.discard_unlisted(run_count, runs_size)
+            digest = self.write_params(params or {})
+            # Every column gets exactly one value for this run, padded with `missing` where absent
+            for name in set(self.get_scalar_names()) | set(scalars):
+                filepath = self.get_scalar_path(name)
+                padding = [self.missing] * (run_count - self.get_length(filepath))
+                self.append_values(filepath, padding + [float(scalars.get(name, self.missing))])
+            # Every offsets column gets exactly one end offset for this run, an empty series where absent
+            for name in set(self.get_metric_names()) | set(metrics):
+                values_path, offsets_path = self.get_metric_paths(name)
+                length = self.get_length(offsets_path, 'q')
+                end = self.read_last(offsets_path, typecode='q') if length else 0
+                values = metrics.get(name, [])
+                self.append_values(values_path, values)
+                self.append_values(offsets_path, [end] * (run_count - length) + [end + len(values)], typecode='q')
+            with open(self.runs_path, 'a', newline='') as runs_file:
+                csv.writer(runs_file, delimiter=';').writerow([experiment, digest])
+            self.write_state(run_count + 1, os.path.getsize(self.runs_path))
+        return run_count
+
+    def get_scalar(self, name):
+        """
+        Return the values of the scalar output `name` for every recorded run.
+        """
+        self.check_name(name)
+        return self.read_column(self.get_scalar_path(name), length=self.get_run_count())
+
+    def get_metric_column(self, name):
+        """
+        Return the offsets and values columns of metric `name`: the series of run `i`
+        is `values[offsets[i - 1]:offsets[i]]`, starting from 0 for the first run.
+        """
+        self.check_name(name)
+        values_path, offsets_path = self.get_metric_paths(name)
+        offsets = self.read_column(offsets_path, length=self.get_run_count(), typecode='q')
+        values = self.read_column(values_path, length=offsets[-1] if len(offsets) else 0)
+        return offsets, values
+
+    def get_metric(self, run, name):
+        """
+        Return the time series of metric `name` recorded for the run with index `run`.
+        """
+        offsets, values = self.get_metric_column(name)
+        if not 0 <= run < len(offsets):
+            return memoryview(array('d'))
+        start = offsets[run - 1] if run > 0 else 0
+        return values[start:offsets[run]]
+
+    def get_table(self):
+        """
+        Return an `OrderedDict` of column name -> column, with an 'Experiment' column naming
+        the experiment of each run, a column per param the runs used, then a column per scalar output.
+        """
+        runs = self.read_runs()
+        table = OrderedDict([('Experiment', [experiment for (experiment, _) in runs])])
+        # Runs of unchanged experiments share their params, so each set is only read once
+        snapshots = {}
+        for _, digest in runs:
+            if digest not in snapshots:
+                snapshots[digest] = self.get_params(digest)
+        for params in snapshots.values():
+            for param in params:
+                if param not in table:
+                    table[param] = [snapshots[digest].get(param, '') for (_, digest) in runs]
+        for name in self.get_scalar_names():
+            table[name] = self.read_column(self.get_scalar_path(name), length=len(runs))
+        return table